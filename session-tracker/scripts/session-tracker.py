@@ -1,7 +1,7 @@
 #!/usr/bin/env -S uv run
 # /// script
 # requires-python = ">=3.11"
-# dependencies = []
+# dependencies = ["orjson"]
 # ///
 """
 SessionStart hook: session-tracker
@@ -10,20 +10,29 @@ Captures session info, generates/retrieves session name, and stores in MODLR dat
 Fires on: startup, resume, clear, compact
 
 Uses: Modlr HTTP API at http://localhost:3456/api/sessions
+If MODLR_SOCK is set, new sessions are first offered to that Modlr datagram
+socket and only POSTed over HTTP if no listener is there.
+
+Set MODLR_WRITE_LOCAL_FILES=1 to also write the legacy per-project files
+.claude/sessions.jsonl and .claude/current-session.json (off by default).
 """
 
-import json
+import atexit
+import http.client
 import os
 import random
+import socket
 import sys
-from datetime import datetime
-from pathlib import Path
-from urllib.request import urlopen, Request
-from urllib.error import URLError, HTTPError
+import threading
+import time
+from typing import Final
+from urllib.parse import urlsplit
+
+import orjson
 
 # === Name Generation Lists ===
 # First names can be simple names, full names with titles, or elaborate phrases
-FIRST_NAMES = [
+FIRST_NAMES: Final[tuple[str, ...]] = (
     # Simple/Classic
     "Gandalf",
     "Merlin",
@@ -85,13 +94,13 @@ FIRST_NAMES = [
     "The Stepmother You Never Wanted",
     "An Increasingly Nervous Flamingo",
     "Greg",
-]
+)
 
 # Second parts grouped by their joining separator
-# Key is the separator, value is list of titles/suffixes
-SECOND_PARTS = {
+# Key is the separator, value is tuple of titles/suffixes
+SECOND_PARTS: Final[dict[str, tuple[str, ...]]] = {
     # Space separator (for "the X" style titles)
-    " ": [
+    " ": (
         "the Magnificent",
         "the Terrible",
         "the Unready",
@@ -111,9 +120,9 @@ SECOND_PARTS = {
         "the Recursive",
         "the Deprecated",
         "the Legacy Code",
-    ],
+    ),
     # Comma separator (for professional titles, locations)
-    ", ": [
+    ", ": (
         "Attorney at Law",
         "CPA",
         "PhD",
@@ -134,9 +143,9 @@ SECOND_PARTS = {
         "who forgot to mute",
         "who meant to reply-all",
         "who's not angry, just disappointed",
-    ],
+    ),
     # Em-dash separator (for parenthetical achievements, clarifications)
-    "—": [
+    "—": (
         "Sexiest Person, 1998-99 (Elevator World Magazine)",
         "Winner, Most Consistent (Participation Magazine)",
         "As Seen on TV's Matlock",
@@ -151,9 +160,9 @@ SECOND_PARTS = {
         "Please Consult Your Doctor",
         "Your Childhood Imaginary Friend",
         "Who's not my real mum",
-    ],
+    ),
     # "of the" separator (for ominous/grand locations)
-    " of the ": [
+    " of the ": (
         "Flesh Cathedral",
         "Screaming Void",
         "Infinite Spreadsheet",
@@ -169,11 +178,63 @@ SECOND_PARTS = {
         "Thousand Jira Tickets",
         "Unanswered Slack Messages",
         "Pending PRs",
-    ],
+    ),
 }
 
+# Every (separator, second part) pair, flattened once so a name costs one pick
+_FLAT_SECONDS: Final[tuple[tuple[str, str], ...]] = tuple(
+    (separator, second)
+    for separator, seconds in SECOND_PARTS.items()
+    for second in seconds
+)
+
+# Bound once to skip the module attribute lookup on each draw
+_choice = random.choice
+
 # Modlr API URL
 MODLR_API_URL = os.environ.get("MODLR_API_URL", "http://localhost:3456")
+_API = urlsplit(MODLR_API_URL)
+_API_PREFIX = _API.path.rstrip("/")
+
+# Modlr datagram socket: takes a single-packet session JSON body, no reply.
+# Opt-in only - a shared default path could be bound by another local user.
+MODLR_SOCK = os.environ.get("MODLR_SOCK")
+
+# Keep-alive connection to the Modlr API, shared by every request in this process
+_conn: http.client.HTTPConnection | None = None
+
+# How long the hook waits at exit for a background session POST to finish
+_CREATE_GRACE_SECONDS = 0.2
+
+# Legacy per-project session files, opt-in via MODLR_WRITE_LOCAL_FILES=1
+_WRITE_LOCAL = os.environ.get("MODLR_WRITE_LOCAL_FILES") == "1"
+
+# Hook input is a small JSON object; anything larger than this is ignored
+_MAX_STDIN_BYTES = 64 * 1024
+
+# Directories this process has already created
+_dirs_made: set[str] = set()
+
+# Fixed hookSpecificOutput envelope; only the context string is encoded per run
+_OUTPUT_PREFIX = (
+    b'{"hookSpecificOutput":{"hookEventName":"SessionStart",'
+    b'"additionalContext":'
+)
+_OUTPUT_SUFFIX = b"}}\n"
+
+# Session context injected into the conversation
+_CONTEXT_TMPL = (
+    "Session: %s\n"
+    "Session ID: %s\n"
+    "Project: %s\n"
+    "Transcript: %s"
+)
+_CONTEXT_RESUMED_TMPL = (
+    "Session: %s (resumed from %s)\n"
+    "Session ID: %s\n"
+    "Project: %s\n"
+    "Transcript: %s"
+)
 
 
 def generate_random_name() -> tuple[str, str]:
@@ -181,34 +242,113 @@ def generate_random_name() -> tuple[str, str]:
     Generate a random name from first name + separator + second part.
     Returns (first_part, full_name) tuple.
     """
-    first = random.choice(FIRST_NAMES)
-    separator = random.choice(list(SECOND_PARTS.keys()))
-    second = random.choice(SECOND_PARTS[separator])
+    first = _choice(FIRST_NAMES)
+    separator, second = _choice(_FLAT_SECONDS)
     full_name = f"{first}{separator}{second}"
     return first, full_name
 
 
+def _dumps(obj: object, option: int = 0) -> bytes:
+    """
+    Encode obj with orjson, falling back to the stdlib encoder for strings
+    orjson rejects (surrogate-escaped paths that are not valid UTF-8).
+    """
+    try:
+        return orjson.dumps(obj, option=option)
+    except orjson.JSONEncodeError:
+        import json  # rare path only; keeps json off the hook's startup imports
+
+        text = json.dumps(obj, indent=2 if option & orjson.OPT_INDENT_2 else None)
+        if option & orjson.OPT_APPEND_NEWLINE:
+            text += "\n"
+        return text.encode("utf-8")
+
+
+def _iso_now() -> str:
+    """Local time as ISO 8601 with microseconds, like datetime.isoformat()."""
+    seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+    stamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(seconds))
+    return f"{stamp}.{nanos // 1000:06d}"
+
+
+def _ensure_dir(path: str) -> None:
+    """Create a directory (and parents) unless this process already did."""
+    if path not in _dirs_made:
+        os.makedirs(path, exist_ok=True)
+        _dirs_made.add(path)
+
+
+def _get_conn() -> http.client.HTTPConnection:
+    """Return the shared Modlr API connection, creating it on first use."""
+    global _conn
+    if _conn is None:
+        if _API.scheme == "https":
+            _conn = http.client.HTTPSConnection(_API.hostname, _API.port, timeout=5)
+        else:
+            _conn = http.client.HTTPConnection(_API.hostname, _API.port, timeout=5)
+    return _conn
+
+
+def _api_request(
+    method: str,
+    path: str,
+    body: bytes | None = None,
+) -> tuple[int, bytes]:
+    """
+    Send a request to the Modlr API over the shared connection.
+    Returns (status, response_body) tuple.
+    """
+    headers = {"Content-Type": "application/json"}
+
+    def send() -> tuple[int, bytes]:
+        global _conn
+        conn = _get_conn()
+        try:
+            conn.request(method, _API_PREFIX + path, body=body, headers=headers)
+            response = conn.getresponse()
+            return response.status, response.read()
+        except Exception:
+            # Never leave the shared connection mid-request for the next caller
+            conn.close()
+            _conn = None
+            raise
+
+    reused = _conn is not None and _conn.sock is not None
+    try:
+        return send()
+    except ConnectionError:
+        if not reused:
+            raise
+        # Stale keep-alive socket - reconnect and retry once
+        return send()
+
+
 def get_session_from_api(session_id: str) -> dict | None:
     """Get a session from the Modlr API."""
     try:
-        url = f"{MODLR_API_URL}/api/sessions/{session_id}"
-        req = Request(url, method="GET")
-        req.add_header("Content-Type", "application/json")
-
-        with urlopen(req, timeout=5) as response:
-            if response.status == 200:
-                return json.loads(response.read().decode("utf-8"))
-    except HTTPError as e:
-        if e.code == 404:
-            return None
-        # Other HTTP errors - return None and fall back to name generation
-        return None
-    except (URLError, TimeoutError, OSError):
+        status, body = _api_request("GET", f"/api/sessions/{session_id}")
+    except (http.client.HTTPException, OSError):
         # Network errors - return None and fall back to name generation
         return None
+    if status == 200:
+        return orjson.loads(body)
+    # 404 or other HTTP errors - return None and fall back to name generation
     return None
 
 
+def _send_session_datagram(payload: bytes) -> bool:
+    """Hand a session payload to the Modlr datagram socket. Returns True if sent."""
+    if not MODLR_SOCK:
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.sendto(payload, MODLR_SOCK)
+    except OSError:
+        # No listener (missing, refused, wrong type) - caller falls back to HTTP
+        return False
+    return True
+
+
 def create_session_via_api(
     session_id: str,
     cwd: str,
@@ -216,23 +356,20 @@ def create_session_via_api(
     nickname: str,
 ) -> bool:
     """Create a session via the Modlr API. Returns True on success."""
+    payload = _dumps({
+        "sessionId": session_id,
+        "cwd": cwd,
+        "transcriptPath": transcript_path,
+        "nickname": nickname,
+        "hidden": False,
+    })
+    if _send_session_datagram(payload):
+        return True
     try:
-        url = f"{MODLR_API_URL}/api/sessions"
-        payload = json.dumps({
-            "sessionId": session_id,
-            "cwd": cwd,
-            "transcriptPath": transcript_path,
-            "nickname": nickname,
-            "hidden": False,
-        }).encode("utf-8")
-
-        req = Request(url, data=payload, method="POST")
-        req.add_header("Content-Type", "application/json")
-
-        with urlopen(req, timeout=5) as response:
-            return response.status in (200, 201)
-    except (URLError, HTTPError, TimeoutError, OSError):
+        status, _ = _api_request("POST", "/api/sessions", body=payload)
+    except (http.client.HTTPException, OSError):
         return False
+    return status in (200, 201)
 
 
 def get_or_create_session(
@@ -259,24 +396,67 @@ def get_or_create_session(
     # New session - generate name and store via API
     first, full_name = generate_random_name()
 
-    # Try to create via API (fire-and-forget, don't fail if API is down)
-    create_session_via_api(session_id, cwd, transcript_path, first)
+    # Try to create via API (fire-and-forget, don't fail if API is down).
+    # The POST runs off the critical path; at exit we give it a short grace
+    # period to finish sending rather than waiting on a slow server.
+    creator = threading.Thread(
+        target=create_session_via_api,
+        args=(session_id, cwd, transcript_path, first),
+        daemon=True,
+    )
+    creator.start()
+    atexit.register(creator.join, timeout=_CREATE_GRACE_SECONDS)
 
     return first, full_name
 
 
+def write_local_session_files(project_dir: str, session_record: dict) -> None:
+    """
+    Append the record to .claude/sessions.jsonl and write it to
+    .claude/current-session.json.
+    """
+    claude_dir = os.path.join(project_dir, ".claude")
+    sessions_file = os.path.join(claude_dir, "sessions.jsonl")
+    payload = _dumps(session_record, option=orjson.OPT_APPEND_NEWLINE)
+
+    try:
+        _ensure_dir(claude_dir)
+        fd = os.open(sessions_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, payload)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+    # Also write current session to a "latest" file for easy access,
+    # swapped in atomically so readers never see a half-written record.
+    # The temp name is per-process so concurrent hooks never share it.
+    latest_file = os.path.join(claude_dir, "current-session.json")
+    latest_tmp = f"{latest_file}.{os.getpid()}.tmp"
+    try:
+        with open(latest_tmp, "wb") as f:
+            f.write(_dumps(session_record, option=orjson.OPT_INDENT_2))
+        os.replace(latest_tmp, latest_file)
+    except OSError:
+        try:
+            os.unlink(latest_tmp)
+        except OSError:
+            pass
+
+
 def main():
     # Read stdin - exit silently if no input
     if sys.stdin.isatty():
         sys.exit(0)
 
-    stdin_content = sys.stdin.read()
-    if not stdin_content:
+    stdin_bytes = sys.stdin.buffer.read(_MAX_STDIN_BYTES + 1)
+    if not stdin_bytes or len(stdin_bytes) > _MAX_STDIN_BYTES:
         sys.exit(0)
 
     try:
-        input_data = json.loads(stdin_content)
-    except json.JSONDecodeError:
+        input_data = orjson.loads(stdin_bytes)
+    except orjson.JSONDecodeError:
         sys.exit(0)
 
     # Extract session info
@@ -295,57 +475,42 @@ def main():
         transcript_path=transcript_path,
     )
 
-    # Build session record for local file storage (backwards compat)
     project_dir = os.environ.get("CLAUDE_PROJECT_DIR", cwd)
-    session_record = {
-        "session_id": session_id,
-        "session_name": full_name,
-        "nickname": nickname,
-        "transcript_path": transcript_path,
-        "cwd": cwd,
-        "source": source,
-        "timestamp": datetime.now().isoformat(),
-        "project_dir": project_dir,
-    }
 
-    # Store session info to file (backwards compat)
-    sessions_file = Path(project_dir) / ".claude" / "sessions.jsonl"
-
-    try:
-        sessions_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(sessions_file, "a") as f:
-            f.write(json.dumps(session_record) + "\n")
-    except (OSError, IOError):
-        pass
-
-    # Also write current session to a "latest" file for easy access
-    latest_file = Path(project_dir) / ".claude" / "current-session.json"
-    try:
-        with open(latest_file, "w") as f:
-            json.dump(session_record, f, indent=2)
-    except (OSError, IOError):
-        pass
+    # Local session files are opt-in (backwards compat); Modlr holds the record
+    if _WRITE_LOCAL:
+        write_local_session_files(project_dir, {
+            "session_id": session_id,
+            "session_name": full_name,
+            "nickname": nickname,
+            "transcript_path": transcript_path,
+            "cwd": cwd,
+            "source": source,
+            "timestamp": _iso_now(),
+            "project_dir": project_dir,
+        })
 
     # Output session info to context via hookSpecificOutput
     # Include all key session details for downstream use
-    context_lines = [
-        f"Session: {full_name}",
-        f"Session ID: {session_id}",
-        f"Project: {project_dir}",
-        f"Transcript: {transcript_path}",
-    ]
-
     if source in ("resume", "compact"):
-        context_lines[0] = f"Session: {nickname} (resumed from {source})"
-
-    output = {
-        "hookSpecificOutput": {
-            "hookEventName": "SessionStart",
-            "additionalContext": "\n".join(context_lines),
-        }
-    }
-
-    print(json.dumps(output))
+        context = _CONTEXT_RESUMED_TMPL % (
+            nickname,
+            source,
+            session_id,
+            project_dir,
+            transcript_path,
+        )
+    else:
+        context = _CONTEXT_TMPL % (
+            full_name,
+            session_id,
+            project_dir,
+            transcript_path,
+        )
+
+    additional_context = _dumps(context)
+    sys.stdout.buffer.write(_OUTPUT_PREFIX + additional_context + _OUTPUT_SUFFIX)
+    sys.stdout.buffer.flush()
     sys.exit(0)
 
 